@@ -1,3 +1,7 @@
-from .api import app
-
-application = app
\ No newline at end of file
+def __getattr__(name):
+    # The app is imported lazily so that entry points such as challenge.train
+    # don't load the whole API stack just by importing the package
+    if name in ("app", "application"):
+        from .api import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
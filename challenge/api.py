@@ -3,29 +3,87 @@ Main FastAPI application.
 """
 import os
 import logging
-from fastapi import FastAPI, HTTPException, Depends
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from typing import Annotated
 
 from .config.settings import settings
-from .core.logging import setup_logging
+from .core.logging import flush_logging, setup_logging
+from .core.routing import ORJSONRoute
 from .core.exceptions import PredictionError, ValidationError
 from .models.schemas import FlightsRequest
-from .services.model_service import ModelService
+from .services.model_service import get_model_service
 from .services.prediction_service import PredictionService
+from .services.prediction_batcher import PredictionBatcher
 
 # Setup logging
-setup_logging()
+setup_logging(buffered=True)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan.
+    Loads the model exactly once, before any request is served, and keeps
+    the services in app.state for the lifetime of the application.
+    """
+    logger.info("Starting %s v%s", settings.app_name, settings.app_version)
+    logger.info("Initializing model service with model_path: %s", settings.model_path)
+    
+    # Log environment info for debugging
+    creds_env = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
+    if creds_env:
+        logger.info("GOOGLE_APPLICATION_CREDENTIALS is set to: %s", creds_env)
+        if os.path.exists(creds_env):
+            logger.info("Credentials file exists at: %s", creds_env)
+        else:
+            logger.warning("Credentials file NOT FOUND at: %s", creds_env)
+    else:
+        logger.warning("GOOGLE_APPLICATION_CREDENTIALS not set")
+    
+    # Don't raise if the model fails to load - this allows health checks to
+    # still work, and /predict answers 503 until a model is available
+    model_service = get_model_service()
+    if model_service.is_trained:
+        logger.info("Model already loaded, reusing it")
+    elif model_service.initialize_model():
+        logger.info("Model loaded successfully during startup")
+    else:
+        logger.error("Failed to load model during startup")
+        logger.error("Model path was: %s", settings.model_path)
+        logger.error("Check the logs above for detailed error information")
+    
+    app.state.prediction_service = PredictionService(model_service)
+    
+    # Start batching concurrent prediction requests
+    app.state.prediction_batcher = PredictionBatcher(app.state.prediction_service)
+    await app.state.prediction_batcher.start()
+    
+    logger.info("Application startup completed")
+    # Write startup logs now rather than when the buffer fills up
+    flush_logging()
+    yield
+    
+    await app.state.prediction_batcher.stop()
+    logger.info("Application shutdown")
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     debug=settings.debug,
-    description="API for predicting flight delays using machine learning"
+    description="API for predicting flight delays using machine learning",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Parse JSON request bodies with orjson
+app.router.route_class = ORJSONRoute
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -35,77 +93,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global instances (singletons)
-_model_service: ModelService = None
-_prediction_service: PredictionService = None
-
 
-def get_model_service() -> ModelService:
+def get_prediction_service(request: Request) -> PredictionService:
     """
-    Get the model service instance (singleton).
+    Get the prediction service created on application startup.
     
-    Returns:
-        ModelService: The model service instance
+    Args:
+        request: The incoming request
         
-    Raises:
-        RuntimeError: If the pre-trained model cannot be loaded
+    Returns:
+        PredictionService: The prediction service instance
     """
-    global _model_service
-    if _model_service is None:
-        _model_service = ModelService()
-        # Load the pre-trained model
-        if not _model_service.initialize_model():
-            logger.error("Failed to load pre-trained model")
-            raise RuntimeError(
-                "Failed to load pre-trained model. Please run 'python -m challenge.train' "
-                "or 'make train' to train and save a model before starting the API."
-            )
-    return _model_service
+    return request.app.state.prediction_service
 
 
-def get_prediction_service(
-    model_service: Annotated[ModelService, Depends(get_model_service)]
-) -> PredictionService:
+def get_prediction_batcher(request: Request) -> PredictionBatcher:
     """
-    Get the prediction service instance (singleton).
+    Get the prediction batcher started on application startup.
     
     Args:
-        model_service: The model service dependency
+        request: The incoming request
         
     Returns:
-        PredictionService: The prediction service instance
+        PredictionBatcher: The prediction batcher instance
     """
-    global _prediction_service
-    if _prediction_service is None:
-        _prediction_service = PredictionService(model_service)
-    return _prediction_service
+    return request.app.state.prediction_batcher
 
 
-@app.get("/health", status_code=200)
-async def get_health() -> dict:
+@app.get("/health", status_code=200, response_class=PlainTextResponse)
+async def get_health() -> PlainTextResponse:
     """
     Health check endpoint.
     
+    Hit by load balancers constantly, so it returns a plain text response
+    directly instead of going through response model validation and JSON encoding.
+    
     Returns:
-        dict: Health status
+        PlainTextResponse: "OK"
     """
-    return {
-        "status": "OK",
-        "service": "Flight Delay Prediction API"
-    }
+    return PlainTextResponse("OK")
 
 
 @app.post("/predict", status_code=200)
 async def post_predict(
     request: FlightsRequest,
-    prediction_service: Annotated[PredictionService, Depends(get_prediction_service)]
+    prediction_service: Annotated[PredictionService, Depends(get_prediction_service)],
+    prediction_batcher: Annotated[PredictionBatcher, Depends(get_prediction_batcher)]
 ) -> dict:
     """
     Predict flight delays.
     
+    Predictions are looked up in the precomputed table; otherwise concurrent
+    requests are batched into a single model call.
+    
     Args:
         request: Flight data for prediction
         prediction_service: Injected prediction service
+        prediction_batcher: Injected prediction batcher
         
     Returns:
         dict: Prediction results
@@ -123,18 +167,24 @@ async def post_predict(
             )
         
         # Make predictions
-        predictions = prediction_service.predict_delays(request)
+        predictions = prediction_service.lookup_delays(request.flights)
+        if predictions is None:
+            predictions = await prediction_batcher.submit(request.flights)
         
         return {"predict": predictions}
         
-    except ValidationError as e:
-        logger.error(f"Validation error: {str(e)}")
+    except HTTPException:
+        raise
+    except ValidationError:
+        # Bad user input is not a service failure, and the exception is not
+        # formatted so invalid payloads stay cheap to reject
+        logger.warning("Validation error")
         raise HTTPException(status_code=400, detail="Invalid input data")
-    except PredictionError as e:
-        logger.error(f"Prediction error: {str(e)}")
+    except PredictionError:
+        logger.exception("Prediction failed")
         raise HTTPException(status_code=500, detail="Prediction failed")
-    except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
+    except Exception:
+        logger.exception("Unexpected error")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -151,60 +201,3 @@ async def root():
         "health": "/health"
     }
 
-
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """
-    Application startup event.
-    Pre-loads the model to avoid cold start delays on first request.
-    """
-    logger.info(f"Starting {settings.app_name} v{settings.app_version}")
-    logger.info(f"Model path configured: {settings.model_path}")
-    
-    # Pre-initialize the model service on startup
-    # This ensures the model is loaded before the first request
-    try:
-        global _model_service
-        if _model_service is None:
-            logger.info(f"Initializing model service with model_path: {settings.model_path}")
-            
-            # Log environment info for debugging
-            creds_env = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
-            if creds_env:
-                logger.info(f"GOOGLE_APPLICATION_CREDENTIALS is set to: {creds_env}")
-                if os.path.exists(creds_env):
-                    logger.info(f"Credentials file exists at: {creds_env}")
-                else:
-                    logger.warning(f"Credentials file NOT FOUND at: {creds_env}")
-            else:
-                logger.warning("GOOGLE_APPLICATION_CREDENTIALS not set")
-            
-            _model_service = ModelService()
-            if _model_service.initialize_model():
-                logger.info("Model loaded successfully during startup")
-            else:
-                logger.error("Failed to load model during startup - API will fail to start")
-                logger.error(f"Model path was: {settings.model_path}")
-                logger.error("Check the logs above for detailed error information")
-                raise RuntimeError("Model initialization failed")
-        else:
-            logger.info("Model service already initialized")
-    except Exception as e:
-        logger.error(f"Startup error: {str(e)}")
-        logger.error(f"Error type: {type(e).__name__}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        # Don't raise here - let FastAPI handle it through the dependency
-        # This allows health checks to still work
-    
-    logger.info("Application startup completed")
-
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """
-    Application shutdown event.
-    """
-    logger.info("Application shutdown")
\ No newline at end of file
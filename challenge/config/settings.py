@@ -24,12 +24,21 @@ class Settings(BaseModel):
         env="DATA_PATH"
     )
     
+    # Tuning settings below are read from the environment explicitly, since
+    # Field(env=...) has no effect on a plain BaseModel
+    
+    # Batching Settings - concurrent /predict requests are grouped into one model call
+    batch_max_size: int = Field(default_factory=lambda: int(os.getenv("BATCH_MAX_SIZE", "128")))
+    batch_max_wait_ms: float = Field(default_factory=lambda: float(os.getenv("BATCH_MAX_WAIT_MS", "8.0")))
+    
     # Logging Settings
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
     log_format: str = Field(
         default="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         env="LOG_FORMAT"
     )
+    # Number of records the API buffers before writing to stdout (0 writes each record)
+    log_buffer_capacity: int = Field(default_factory=lambda: int(os.getenv("LOG_BUFFER_CAPACITY", "512")))
     
     class Config:
         env_file = ".env"
@@ -4,12 +4,16 @@ from .exceptions import (
     PredictionError,
     ValidationError
 )
-from .logging import setup_logging
+from .logging import flush_logging, setup_logging
+from .routing import ORJSONRequest, ORJSONRoute
 
 __all__ = [
     "ModelNotAvailableError",
     "ModelTrainingError", 
     "PredictionError",
     "ValidationError",
-    "setup_logging"
+    "setup_logging",
+    "flush_logging",
+    "ORJSONRequest",
+    "ORJSONRoute"
 ]
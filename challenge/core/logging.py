@@ -1,27 +1,53 @@
+import atexit
 import logging
+import logging.handlers
 import sys
 from typing import Optional
 
 from ..config.settings import settings
 
 
-def setup_logging(log_level: Optional[str] = None) -> None:
+def setup_logging(log_level: Optional[str] = None, buffered: bool = False) -> None:
     """
     Setup application logging configuration.
     
+    With buffered=True, records are kept in memory and written to stdout in
+    batches of settings.log_buffer_capacity (0 disables buffering). WARNING and
+    more severe records flush the buffer immediately, and flush_logging()
+    flushes it on demand.
+    
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        buffered: Whether to buffer records before writing them
     """
     level = log_level or settings.log_level
     
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(settings.log_format))
+    
+    if buffered and settings.log_buffer_capacity > 0:
+        handler = logging.handlers.MemoryHandler(
+            capacity=settings.log_buffer_capacity,
+            flushLevel=logging.WARNING,
+            target=handler,
+            flushOnClose=True
+        )
+        # Don't lose buffered records on shutdown
+        atexit.register(handler.flush)
+    
     logging.basicConfig(
         level=getattr(logging, level.upper()),
-        format=settings.log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[handler]
     )
     
     # Set specific loggers
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("fastapi").setLevel(logging.INFO)
+
+
+def flush_logging() -> None:
+    """
+    Write out records buffered by the root logger's handlers.
+    """
+    for handler in logging.getLogger().handlers:
+        handler.flush()
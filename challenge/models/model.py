@@ -1,11 +1,57 @@
-from typing import Tuple, Union, List
+from functools import lru_cache
+from typing import Any, Dict, Sequence, Tuple, Union, List
 
 import pandas as pd
 import numpy as np
 import xgboost as xgb
 from sklearn.utils import shuffle
 
-from ..utils import get_min_diff, top_10_features
+from ..utils import top_10_features
+
+
+def _build_category_index(columns: List[str]) -> Dict[str, Dict[Any, int]]:
+    """
+    Map each category value of the one-hot columns to its column position.
+
+    Args:
+        columns (List[str]): one-hot column names, e.g. "MES_7".
+
+    Returns:
+        Dict[str, Dict[Any, int]]: {feature: {value: position}}.
+    """
+    index = {}
+    for position, column in enumerate(columns):
+        feature, _, value = column.partition("_")
+        index.setdefault(feature, {})[int(value) if feature == "MES" else value] = position
+    return index
+
+
+# Column labels of the feature frames, built once instead of on every preprocess
+_FEATURE_COLUMNS = pd.Index(top_10_features)
+_CATEGORY_INDEX = _build_category_index(top_10_features)
+_OPERA_INDEX = _CATEGORY_INDEX.get("OPERA", {})
+_TIPOVUELO_INDEX = _CATEGORY_INDEX.get("TIPOVUELO", {})
+_MES_INDEX = _CATEGORY_INDEX.get("MES", {})
+
+
+@lru_cache(maxsize=8192)
+def _feature_positions(opera: str, tipovuelo: str, mes: int) -> Tuple[int, ...]:
+    """
+    Get the top 10 columns set to 1 for a flight.
+
+    Inputs span a small set of combinations, so positions are cached per
+    (OPERA, TIPOVUELO, MES) instead of looked up field by field.
+
+    Args:
+        opera (str): airline name.
+        tipovuelo (str): flight type.
+        mes (int): month.
+
+    Returns:
+        Tuple[int, ...]: positions of the flight's one-hot columns.
+    """
+    columns = (_OPERA_INDEX.get(opera), _TIPOVUELO_INDEX.get(tipovuelo), _MES_INDEX.get(mes))
+    return tuple(column for column in columns if column is not None)
 
 
 class DelayModel:
@@ -15,6 +61,7 @@ class DelayModel:
     ):
         self._model = None # Model should be saved in this attribute.
         self._feature_columns = None  # Store feature column names for consistency
+        self._booster = None  # Underlying booster, used for fast predictions
 
     def preprocess(
         self,
@@ -33,46 +80,68 @@ class DelayModel:
             or
             pd.DataFrame: features.
         """
-        data = data.copy()
-
         if target_column is not None:
-            data['min_diff'] = data.apply(get_min_diff, axis=1)
-            data[target_column] = np.where(data['min_diff'] > 15, 1, 0)
+            # Only training adds columns; prediction just reads the input
+            data = data.copy()
+            fecha_o = pd.to_datetime(data['Fecha-O'], format='%Y-%m-%d %H:%M:%S')
+            fecha_i = pd.to_datetime(data['Fecha-I'], format='%Y-%m-%d %H:%M:%S')
+            data['min_diff'] = (fecha_o - fecha_i).dt.total_seconds() / 60
+            data[target_column] = (data['min_diff'] > 15).astype(np.int8)
             data = shuffle(data[['OPERA', 'MES', 'TIPOVUELO', 'SIGLADES', 'DIANOM', 'delay']], random_state = 111)
 
-        # Encode categorical features efficiently and handle missing values gracefully
-        opera_dummies = pd.get_dummies(data['OPERA'], prefix='OPERA', dummy_na=True)
-        tipovuelo_dummies = pd.get_dummies(data['TIPOVUELO'], prefix='TIPOVUELO', dummy_na=True)
-        mes_dummies = pd.get_dummies(data['MES'], prefix='MES')
-
-        features = pd.concat(
-            [opera_dummies, tipovuelo_dummies, mes_dummies],
-            axis=1
+        # Encode only the top 10 features, straight into a NumPy array
+        features = pd.DataFrame(
+            self.encode(data['OPERA'].values, data['TIPOVUELO'].values, data['MES'].values),
+            columns=_FEATURE_COLUMNS,
+            index=data.index
         )
 
-        # Ensure consistent feature columns between training and prediction
+        # Store the feature column names used during training
         if self._feature_columns is None:
-            # During training, store the feature column names
-            self._feature_columns = features.columns.tolist()
-        
-        # For prediction, ensure all expected columns exist
-        if self._feature_columns is not None:
-            # Add missing columns with 0 values
-            for col in self._feature_columns:
-                if col not in features.columns:
-                    features[col] = 0
-            
-            # Remove extra columns that weren't in training
-            features = features[self._feature_columns]
-
-        # Filter to top 10 features
-        features = features[top_10_features]
+            self._feature_columns = tuple(features.columns)
 
         if target_column is not None:
             target = data[[target_column]]
             return features, target
         return features
 
+    def encode(
+        self,
+        opera: Sequence[str],
+        tipovuelo: Sequence[str],
+        mes: Sequence[int],
+        out: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        One-hot encode flights into the top 10 feature columns.
+
+        Values without a top 10 column (unknown airlines, other months, ...)
+        leave their row untouched.
+
+        Args:
+            opera (Sequence[str]): airline names.
+            tipovuelo (Sequence[str]): flight types.
+            mes (Sequence[int]): months.
+            out (np.ndarray, optional): (n_flights, 10) float32 array to
+                write the features into instead of allocating a new one.
+
+        Returns:
+            np.ndarray: (n_flights, 10) float32 feature matrix.
+        """
+        if out is None:
+            # float32 is what the booster consumes, so predict needs no copy
+            features = np.zeros((len(opera), len(top_10_features)), dtype=np.float32)
+        else:
+            features = out
+            features.fill(0.0)
+        # Mapping strings to columns needs a hash lookup per flight either way;
+        # this loop over cached positions is faster than pandas map + numpy
+        # scatter for any batch size, from single requests to training data
+        for row, key in enumerate(zip(opera, tipovuelo, mes)):
+            for column in _feature_positions(*key):
+                features[row, column] = 1.0
+        return features
+
     def fit(
         self,
         features: pd.DataFrame,
@@ -91,22 +160,89 @@ class DelayModel:
         n_y1 = len(target[target == 1])
         scale = n_y0/n_y1
 
-        xgb_model = xgb.XGBClassifier(random_state=1, learning_rate=0.01, scale_pos_weight = scale)
+        # A single thread per model: API workers provide the parallelism
+        xgb_model = xgb.XGBClassifier(random_state=1, learning_rate=0.01, scale_pos_weight = scale, n_jobs=1)
         xgb_model.fit(features, target)
         self._model = xgb_model
+        self._booster = xgb_model.get_booster()
+
+    def _get_booster(self) -> xgb.Booster:
+        """
+        Get the underlying booster of the fitted classifier.
+
+        Returns:
+            xgb.Booster: booster of the fitted classifier.
+        """
+        # Models pickled before the booster was cached only hold the classifier
+        if getattr(self, "_booster", None) is None:
+            self._booster = self._model.get_booster()
+        return self._booster
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Pickle the fitted model in XGBoost's own binary format.
+
+        The classifier is stored as the booster's UBJSON bytes plus its
+        parameters instead of the pickled sklearn wrapper, so saved models
+        load across xgboost and scikit-learn versions.
+
+        Returns:
+            Dict[str, Any]: picklable state.
+        """
+        if self._model is None:
+            return self.__dict__.copy()
+        return {
+            "_feature_columns": self._feature_columns,
+            "_params": self._model.get_params(),
+            "_booster_raw": bytes(self._get_booster().save_raw("ubj")),
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restore a pickled model.
+
+        Args:
+            state (Dict[str, Any]): state returned by __getstate__, or the plain
+                __dict__ of models pickled before it existed.
+        """
+        if "_booster_raw" not in state:
+            self.__dict__.update(state)
+            return
+        xgb_model = xgb.XGBClassifier(**state["_params"])
+        xgb_model.load_model(bytearray(state["_booster_raw"]))
+        self._model = xgb_model
+        self._feature_columns = state["_feature_columns"]
+        self._booster = xgb_model.get_booster()
+
+    def warm_up(self) -> None:
+        """
+        Prepare the fitted model for serving.
+
+        Pins the booster to a single thread, so concurrent requests don't
+        oversubscribe cores, and runs a dummy prediction so the first request
+        doesn't pay for the predictor's buffer allocation.
+        """
+        xgb.set_config(verbosity=0)
+        booster = self._get_booster()
+        booster.set_param({"nthread": 1})
+        booster.inplace_predict(np.zeros((1, len(top_10_features)), dtype=np.float32))
 
     def predict(
         self,
-        features: pd.DataFrame
+        features: Union[pd.DataFrame, np.ndarray]
     ) -> List[int]:
         """
         Predict delays for new flights.
 
+        Calls the booster directly on a dense float32 array, skipping the
+        sklearn wrapper and the DMatrix construction.
+
         Args:
-            features (pd.DataFrame): preprocessed data.
+            features (Union[pd.DataFrame, np.ndarray]): preprocessed data.
         
         Returns:
             (List[int]): predicted targets.
         """
-        predictions = self._model.predict(features)
-        return predictions.tolist()
\ No newline at end of file
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        probabilities = self._get_booster().inplace_predict(features)
+        return (probabilities > 0.5).astype(np.int8).tolist()
\ No newline at end of file
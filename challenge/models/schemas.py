@@ -1,8 +1,8 @@
-from pydantic import BaseModel, Field, model_validator
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Literal
 
 # Allowed values (taken from dataset/model context)
-ALLOWED_OPERAS = {
+ALLOWED_OPERAS = frozenset({
     "Aerolineas Argentinas",
     "Air Canada",
     "Air France",
@@ -23,31 +23,27 @@ ALLOWED_OPERAS = {
     "Sky Airline",
     "United Airlines",
     "Qantas Airways"
-}
-ALLOWED_TIPOVUELO = {"N", "I"}
-ALLOWED_MES = set(range(1, 13))
+})
+ALLOWED_TIPOVUELO = frozenset({"N", "I"})
+ALLOWED_MES = frozenset(range(1, 13))
+
+# Field types accepting only the allowed values, checked by pydantic-core
+Opera = Literal[tuple(sorted(ALLOWED_OPERAS))]
+TipoVuelo = Literal[tuple(sorted(ALLOWED_TIPOVUELO))]
+
 
 class FlightItem(BaseModel):
-    OPERA: str = Field(..., description="Airlines company name", example="Aerolineas Argentinas")
-    TIPOVUELO: str = Field(..., description="Flight type: N (National) or I (International)", example="N")
-    MES: int = Field(..., description="Month of the flight (1-12)", example=3)
-
-    @model_validator(mode='after')
-    def validate_inputs(self):
-        opera = self.OPERA
-        tipovuelo = self.TIPOVUELO
-        mes = self.MES
-        
-        if opera not in ALLOWED_OPERAS:
-            raise ValueError(f"Invalid OPERA: {opera}. Allowed values: {list(ALLOWED_OPERAS)}")
-        if tipovuelo not in ALLOWED_TIPOVUELO:
-            raise ValueError(f"Invalid TIPOVUELO: {tipovuelo}. Allowed values: {list(ALLOWED_TIPOVUELO)}")
-        if mes not in ALLOWED_MES:
-            raise ValueError(f"Invalid MES: {mes}. Allowed values: {list(ALLOWED_MES)}")
-        
-        return self
+    # Requests are read-only once validated; unknown keys are dropped
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
+    OPERA: Opera = Field(..., description="Airlines company name", example="Aerolineas Argentinas")
+    TIPOVUELO: TipoVuelo = Field(..., description="Flight type: N (National) or I (International)", example="N")
+    MES: int = Field(..., ge=min(ALLOWED_MES), le=max(ALLOWED_MES), description="Month of the flight (1-12)", example=3)
+
 
 class FlightsRequest(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
     flights: List[FlightItem] = Field(..., description="List of flight data to predict delays for", example=[
         {
             "OPERA": "Aerolineas Argentinas",
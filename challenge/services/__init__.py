@@ -1,4 +1,5 @@
-from .model_service import ModelService
+from .model_service import ModelService, get_model_service
 from .prediction_service import PredictionService
+from .prediction_batcher import PredictionBatcher
 
-__all__ = ["ModelService", "PredictionService"]
+__all__ = ["ModelService", "get_model_service", "PredictionService", "PredictionBatcher"]
@@ -1,12 +1,16 @@
 import os
 import pickle
 import logging
-from io import BytesIO
-from typing import Optional, Tuple
+import tempfile
+import threading
+from itertools import product
+from typing import Dict, Optional, Tuple
+import joblib
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 
 from ..models.model import DelayModel
+from ..models.schemas import ALLOWED_MES, ALLOWED_OPERAS, ALLOWED_TIPOVUELO
 from ..config.settings import settings
 from ..core.exceptions import ModelTrainingError, ModelNotAvailableError
 
@@ -15,10 +19,36 @@ logger = logging.getLogger(__name__)
 # Try to import Google Cloud Storage, but make it optional
 try:
     from google.cloud import storage
+    from google.cloud.storage import transfer_manager
     GCS_AVAILABLE = True
 except ImportError:
     GCS_AVAILABLE = False
     storage = None
+    transfer_manager = None
+
+# Model transfers to/from GCS are split into chunks sent over parallel connections
+GCS_CHUNK_SIZE = 32 * 1024 * 1024
+GCS_MAX_WORKERS = 8
+
+# Try to import zstandard, used to compress models stored in GCS, but make it optional
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstd = None
+
+# Zstandard frames start with these bytes, which tells compressed models apart
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ZSTD_LEVEL = 3
+
+# Try to import pyarrow's multithreaded CSV reader, but make it optional
+try:
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pacsv = None
 
 
 class ModelService:
@@ -32,6 +62,9 @@ class ModelService:
         self.data_path = data_path or settings.data_path
         self.model: Optional[DelayModel] = None
         self.is_trained = False
+        # Prediction for every allowed (OPERA, TIPOVUELO, MES) combination
+        self.prediction_table: Dict[Tuple[str, str, int], int] = {}
+        self._gcs_client = None
     
     def _is_gcs_path(self, path: str) -> bool:
         """
@@ -45,6 +78,20 @@ class ModelService:
         """
         return path.startswith("gs://")
     
+    def _get_gcs_client(self):
+        """
+        Get the Google Cloud Storage client, creating it on first use.
+        
+        Creating a client runs credential discovery, so one client is reused
+        for every GCS operation of this service.
+        
+        Returns:
+            storage.Client: The GCS client
+        """
+        if self._gcs_client is None:
+            self._gcs_client = storage.Client()
+        return self._gcs_client
+    
     def _parse_gcs_path(self, gcs_path: str) -> Tuple[str, str]:
         """
         Parse a GCS path into bucket name and blob name.
@@ -85,6 +132,36 @@ class ModelService:
             logger.error(f"Error loading model: {str(e)}")
             return False
     
+    def _read_model(self, path: str) -> DelayModel:
+        """
+        Deserialize a model from a local file.
+        
+        Local models are written uncompressed with joblib. Zstandard-compressed
+        models, as stored in GCS, are detected by their magic bytes and
+        decompressed while unpickling. Older artifacts written with plain
+        pickle are still readable.
+        
+        Args:
+            path: Local path of the model file
+            
+        Returns:
+            DelayModel: The deserialized model
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(ZSTD_MAGIC)) == ZSTD_MAGIC:
+                if not ZSTD_AVAILABLE:
+                    raise RuntimeError("Model is zstd-compressed but zstandard is not installed. Install with: pip install zstandard")
+                f.seek(0)
+                with zstd.ZstdDecompressor().stream_reader(f) as reader:
+                    return pickle.load(reader)
+        try:
+            return joblib.load(path)
+        except FileNotFoundError:
+            raise
+        except Exception:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+    
     def _load_from_local(self) -> bool:
         """
         Load model from local file system.
@@ -92,15 +169,16 @@ class ModelService:
         Returns:
             bool: True if model loaded successfully, False otherwise
         """
-        if os.path.exists(self.model_path):
-            with open(self.model_path, 'rb') as f:
-                self.model = pickle.load(f)
-            self.is_trained = True
-            logger.info(f"Model loaded successfully from local path: {self.model_path}")
-            return True
-        else:
+        # Opening directly instead of checking existence first saves a
+        # round-trip on network-backed filesystems
+        try:
+            self.model = self._read_model(self.model_path)
+        except FileNotFoundError:
             logger.warning(f"Model file not found at {self.model_path}")
             return False
+        self.is_trained = True
+        logger.info(f"Model loaded successfully from local path: {self.model_path}")
+        return True
     
     def _load_from_gcs(self) -> bool:
         """
@@ -131,7 +209,7 @@ class ModelService:
             # On Cloud Run, this automatically uses the service account credentials
             # For local dev, uses GOOGLE_APPLICATION_CREDENTIALS env var or ADC
             try:
-                client = storage.Client()
+                client = self._get_gcs_client()
                 logger.info("GCS client initialized successfully")
             except Exception as auth_error:
                 logger.error(f"Failed to initialize GCS client. Authentication error: {str(auth_error)}")
@@ -153,9 +231,18 @@ class ModelService:
             
             # Download and load model
             logger.info(f"Downloading model from GCS: {self.model_path}")
-            logger.info(f"Model size: {blob.size} bytes")
-            model_bytes = blob.download_as_bytes()
-            self.model = pickle.loads(model_bytes)
+            # Download in parallel chunks to a local temporary file, which the
+            # chunk workers write into at their own offsets
+            with tempfile.NamedTemporaryFile(suffix=".pkl") as f:
+                transfer_manager.download_chunks_concurrently(
+                    blob,
+                    f.name,
+                    chunk_size=GCS_CHUNK_SIZE,
+                    max_workers=GCS_MAX_WORKERS,
+                    worker_type=transfer_manager.THREAD
+                )
+                logger.info(f"Model size: {blob.size} bytes")
+                self.model = self._read_model(f.name)
             self.is_trained = True
             logger.info(f"Model loaded successfully from GCS: {self.model_path}")
             return True
@@ -211,11 +298,30 @@ class ModelService:
         if dir_path:
             os.makedirs(dir_path, exist_ok=True)
         
-        with open(self.model_path, 'wb') as f:
-            pickle.dump(self.model, f)
+        # Uncompressed joblib with the highest pickle protocol loads fastest
+        joblib.dump(self.model, self.model_path, compress=0, protocol=pickle.HIGHEST_PROTOCOL)
         logger.info(f"Model saved successfully to local path: {self.model_path}")
         return True
     
+    def _write_compressed_model(self, path: str) -> None:
+        """
+        Serialize the model to a local file, compressed with zstandard if available.
+        
+        Compression shrinks the bytes transferred to and from GCS, and zstd
+        decompresses close to memory speed, so it is used for remote models.
+        Local reads are cheap enough that compression saves next to nothing,
+        so local models stay plain joblib files that load without zstandard.
+        
+        Args:
+            path: Local path to write the model to
+        """
+        if not ZSTD_AVAILABLE:
+            joblib.dump(self.model, path, compress=0, protocol=pickle.HIGHEST_PROTOCOL)
+            return
+        compressor = zstd.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+        with open(path, 'wb') as f, compressor.stream_writer(f) as writer:
+            pickle.dump(self.model, writer, protocol=pickle.HIGHEST_PROTOCOL)
+    
     def _save_to_gcs(self) -> bool:
         """
         Save model to Google Cloud Storage.
@@ -231,16 +337,24 @@ class ModelService:
             bucket_name, blob_name = self._parse_gcs_path(self.model_path)
             
             # Initialize GCS client
-            client = storage.Client()
+            client = self._get_gcs_client()
             bucket = client.bucket(bucket_name)
             blob = bucket.blob(blob_name)
             
-            # Serialize model to bytes
-            model_bytes = pickle.dumps(self.model)
-            
-            # Upload to GCS
-            logger.info(f"Uploading model to GCS: {self.model_path}")
-            blob.upload_from_string(model_bytes, content_type='application/octet-stream')
+            # Serialize model to a local temporary file
+            with tempfile.NamedTemporaryFile(suffix=".pkl") as f:
+                self._write_compressed_model(f.name)
+                
+                # Upload to GCS in parallel chunks
+                logger.info(f"Uploading model to GCS: {self.model_path}")
+                transfer_manager.upload_chunks_concurrently(
+                    f.name,
+                    blob,
+                    content_type='application/octet-stream',
+                    chunk_size=GCS_CHUNK_SIZE,
+                    max_workers=GCS_MAX_WORKERS,
+                    worker_type=transfer_manager.THREAD
+                )
             logger.info(f"Model saved successfully to GCS: {self.model_path}")
             return True
             
@@ -248,6 +362,63 @@ class ModelService:
             logger.error(f"Error saving model to GCS: {str(e)}")
             return False
     
+    def _read_csv(self, source) -> pd.DataFrame:
+        """
+        Read a CSV file into a DataFrame.
+        
+        Uses pyarrow's multithreaded CSV parser when available, and falls back
+        to pandas otherwise.
+        
+        Args:
+            source: Path or binary file object of the CSV
+            
+        Returns:
+            pd.DataFrame: Parsed data
+        """
+        if not PYARROW_AVAILABLE:
+            return pd.read_csv(source)
+        table = pacsv.read_csv(source, read_options=pacsv.ReadOptions(use_threads=True))
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    
+    def _read_cached_csv(self, path: str) -> pd.DataFrame:
+        """
+        Read a local CSV file through a Parquet cache stored next to it.
+        
+        The cache is stamped with the CSV's modification time and used while
+        the two match, so any change to the CSV, even one that moves its
+        mtime backwards, rebuilds it. Failing to write it, e.g. on a
+        read-only mount, is not an error.
+        
+        Args:
+            path: Local path of the CSV file
+            
+        Returns:
+            pd.DataFrame: Parsed data
+        """
+        if not PYARROW_AVAILABLE:
+            return self._read_csv(path)
+        
+        csv_mtime = os.stat(path).st_mtime_ns
+        parquet_path = os.path.splitext(path)[0] + ".parquet"
+        try:
+            if os.stat(parquet_path).st_mtime_ns == csv_mtime:
+                df = pd.read_parquet(parquet_path, engine='pyarrow')
+                logger.info(f"Read training data from Parquet cache: {parquet_path}")
+                return df
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable Parquet cache {parquet_path}: {str(e)}")
+        
+        df = self._read_csv(path)
+        try:
+            df.to_parquet(parquet_path, engine='pyarrow', compression='zstd', index=False)
+            os.utime(parquet_path, ns=(csv_mtime, csv_mtime))
+            logger.info(f"Cached training data as Parquet: {parquet_path}")
+        except Exception as e:
+            logger.warning(f"Could not write Parquet cache {parquet_path}: {str(e)}")
+        return df
+    
     def _load_data_from_local(self) -> pd.DataFrame:
         """
         Load training data from local file system.
@@ -255,13 +426,13 @@ class ModelService:
         Returns:
             pd.DataFrame: Loaded data, or None if failed
         """
-        if not os.path.exists(self.data_path):
-            logger.error(f"Training data not found at {self.data_path}")
-            return None
         try:
-            df = pd.read_csv(self.data_path)
+            df = self._read_cached_csv(self.data_path)
             logger.info(f"Loaded training data from local path: {self.data_path}")
             return df
+        except FileNotFoundError:
+            logger.error(f"Training data not found at {self.data_path}")
+            return None
         except Exception as e:
             logger.error(f"Error loading data from local path: {str(e)}")
             return None
@@ -282,7 +453,7 @@ class ModelService:
             
             # Initialize GCS client
             try:
-                client = storage.Client()
+                client = self._get_gcs_client()
             except Exception as auth_error:
                 logger.error(f"Failed to initialize GCS client. Authentication error: {str(auth_error)}")
                 logger.error("Run: gcloud auth application-default login")
@@ -296,12 +467,10 @@ class ModelService:
                 logger.error(f"Training data not found in GCS: {self.data_path}")
                 return None
             
-            # Download data
+            # Download data, parsing the CSV while it is being downloaded
             logger.info(f"Downloading training data from GCS: {self.data_path}")
-            data_bytes = blob.download_as_bytes()
-            
-            # Read CSV from bytes
-            df = pd.read_csv(BytesIO(data_bytes))
+            with blob.open('rb') as f:
+                df = self._read_csv(f)
             logger.info(f"Loaded training data from GCS: {self.data_path}")
             return df
             
@@ -338,12 +507,12 @@ class ModelService:
                 target_column="delay"
             )
             
-            # Split data
-            x_train, _, y_train, _ = train_test_split(
-                features, target, 
-                test_size=0.33, 
-                random_state=42
-            )
+            # Sample the 67% training split only; the held-out rows are never used here
+            n_rows = len(features)
+            n_train = n_rows - int(np.ceil(n_rows * 0.33))
+            train_idx = np.random.default_rng(42).permutation(n_rows)[:n_train]
+            x_train = features.iloc[train_idx]
+            y_train = target.iloc[train_idx]
             
             # Train model
             self.model.fit(features=x_train, target=y_train)
@@ -368,12 +537,32 @@ class ModelService:
         """
         # Load existing model
         if self.load_model():
+            self.model.warm_up()
+            self._build_prediction_table()
             return True
         
         logger.error(f"Failed to load pre-trained model from {self.model_path}")
         logger.error("Please run 'python -m challenge.train' or 'make train' to train and save a model before starting the API")
         return False
     
+    def _build_prediction_table(self) -> None:
+        """
+        Precompute the prediction of every allowed input combination.
+        
+        Predictions only depend on OPERA, TIPOVUELO and MES, whose allowed values
+        span a few hundred combinations, so they are all predicted in one batch.
+        If this fails the table stays empty and predictions use the model.
+        """
+        keys = list(product(sorted(ALLOWED_OPERAS), sorted(ALLOWED_TIPOVUELO), sorted(ALLOWED_MES)))
+        try:
+            data = pd.DataFrame(keys, columns=["OPERA", "TIPOVUELO", "MES"])
+            predictions = self.model.predict(self.model.preprocess(data))
+            self.prediction_table = dict(zip(keys, predictions))
+            logger.info(f"Precomputed predictions for {len(self.prediction_table)} input combinations")
+        except Exception as e:
+            self.prediction_table = {}
+            logger.warning(f"Could not precompute predictions, using the model instead: {str(e)}")
+    
     def get_model(self) -> DelayModel:
         """
         Get the trained model.
@@ -387,3 +576,26 @@ class ModelService:
         if not self.is_trained or self.model is None:
             raise ModelNotAvailableError("Model not trained or not available")
         return self.model
+
+
+# Process-wide model service, shared by every application instance
+_instance: Optional[ModelService] = None
+_instance_lock = threading.Lock()
+
+
+def get_model_service() -> ModelService:
+    """
+    Get the process-wide model service, creating it on first use.
+    
+    The loaded model and the prediction table are then shared instead of
+    being rebuilt by each application instance.
+    
+    Returns:
+        ModelService: The shared model service
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = ModelService()
+    return _instance
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from ..config.settings import settings
+from ..models.schemas import FlightItem
+from .prediction_service import PredictionService
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionBatcher:
+    """
+    Coalesces concurrent prediction requests into a single model call.
+
+    Requests are queued together with a future. A single background worker
+    collects up to ``max_batch_size`` requests, waiting at most ``max_wait_ms``
+    after the first one arrives, predicts all their flights at once and
+    scatters the results back to each request.
+    """
+
+    def __init__(
+        self,
+        prediction_service: PredictionService,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None
+    ):
+        self.prediction_service = prediction_service
+        self.max_batch_size = max_batch_size or settings.batch_max_size
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else settings.batch_max_wait_ms
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Check if the background worker is running.
+
+        Returns:
+            bool: True if requests are being processed, False otherwise
+        """
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """
+        Start the background worker on the running event loop.
+        """
+        if not self.is_running:
+            self._worker = asyncio.create_task(self._run())
+            logger.info(
+                "Prediction batcher started (max_batch_size=%d, max_wait_ms=%s)",
+                self.max_batch_size,
+                self.max_wait_ms
+            )
+
+    async def stop(self) -> None:
+        """
+        Stop the background worker.
+        """
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        logger.info("Prediction batcher stopped")
+
+    async def submit(self, flights: List[FlightItem]) -> List[int]:
+        """
+        Queue flights for prediction and wait for the batched result.
+
+        Args:
+            flights: Flights to predict delays for
+
+        Returns:
+            List[int]: List of predictions (0 or 1), in the same order as flights
+
+        Raises:
+            RuntimeError: If the batcher has not been started
+            PredictionError: If the batched prediction fails
+        """
+        if not self.is_running:
+            raise RuntimeError("Prediction batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((flights, future))
+        return await future
+
+    async def _run(self) -> None:
+        """
+        Worker loop: collect a batch, predict it and scatter the results.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._process(batch)
+
+    async def _process(self, batch: List[Tuple[List[FlightItem], asyncio.Future]]) -> None:
+        """
+        Predict every flight of the batch at once and resolve each future.
+
+        The model call runs in the threadpool so the event loop keeps
+        accepting and queueing requests meanwhile.
+
+        Args:
+            batch: Queued (flights, future) pairs
+        """
+        flights = [flight for request_flights, _ in batch for flight in request_flights]
+        try:
+            predictions = await run_in_threadpool(self.prediction_service.predict_flights, flights)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for request_flights, future in batch:
+            count = len(request_flights)
+            # The future is already done if the client went away
+            if not future.done():
+                future.set_result(predictions[offset:offset + count])
+            offset += count
@@ -1,13 +1,45 @@
 import logging
-import pandas as pd
-from typing import List
+import threading
+import numpy as np
+from typing import List, Optional
 
-from ..models.schemas import FlightsRequest
+from ..models.schemas import FlightItem, FlightsRequest
 from ..core.exceptions import PredictionError, ValidationError
+from ..utils import top_10_features
 from .model_service import ModelService
 
 logger = logging.getLogger(__name__)
 
+# Per-thread feature matrix, reused across predictions
+_scratch = threading.local()
+
+# Largest buffer kept per thread (320 KB); bigger batches get a one-off array
+_MAX_BUFFER_ROWS = 8192
+
+
+def _get_feature_buffer(n_rows: int) -> np.ndarray:
+    """
+    Get a (n_rows, 10) float32 view over this thread's feature buffer.
+    
+    The buffer grows to the largest batch seen, up to _MAX_BUFFER_ROWS rows,
+    so steady state predictions don't allocate a new feature matrix. Larger
+    batches get a fresh array that is freed after use, so a single huge
+    request doesn't pin memory in every thread that served one.
+    
+    Args:
+        n_rows: Number of flights to encode
+        
+    Returns:
+        np.ndarray: View over the first n_rows rows of the buffer, or a new
+            array when n_rows exceeds _MAX_BUFFER_ROWS
+    """
+    if n_rows > _MAX_BUFFER_ROWS:
+        return np.empty((n_rows, len(top_10_features)), dtype=np.float32)
+    buffer = getattr(_scratch, "buffer", None)
+    if buffer is None or len(buffer) < n_rows:
+        buffer = _scratch.buffer = np.zeros((max(n_rows, 256), len(top_10_features)), dtype=np.float32)
+    return buffer[:n_rows]
+
 
 class PredictionService:
     """
@@ -27,31 +59,68 @@ class PredictionService:
         Returns:
             List[int]: List of predictions (0 or 1)
             
+        Raises:
+            PredictionError: If prediction fails
+            ValidationError: If input validation fails
+        """
+        return self.predict_flights(request.flights)
+    
+    def lookup_delays(self, flights: List[FlightItem]) -> Optional[List[int]]:
+        """
+        Look up precomputed predictions for flights.
+        
+        Args:
+            flights: Flights to predict delays for
+            
+        Returns:
+            Optional[List[int]]: List of predictions (0 or 1), or None if any
+                flight has no precomputed prediction
+        """
+        table = self.model_service.prediction_table
+        try:
+            return [table[(flight.OPERA, flight.TIPOVUELO, flight.MES)] for flight in flights]
+        except KeyError:
+            return None
+    
+    def predict_flights(self, flights: List[FlightItem]) -> List[int]:
+        """
+        Predict delays for flights with a single model call.
+        
+        Args:
+            flights: Flights to predict delays for, possibly gathered
+                from several requests
+            
+        Returns:
+            List[int]: List of predictions (0 or 1), in the same order as flights
+            
         Raises:
             PredictionError: If prediction fails
             ValidationError: If input validation fails
         """
         try:
-            # Convert list of dicts to DataFrame
-            data = pd.DataFrame([flight.model_dump() for flight in request.flights])
+            # Gather the input columns, reading the fields directly
+            opera = [flight.OPERA for flight in flights]
+            tipovuelo = [flight.TIPOVUELO for flight in flights]
+            mes = [flight.MES for flight in flights]
             
             # Get the trained model
             model = self.model_service.get_model()
             
-            # Preprocess the input data
-            features = model.preprocess(data)
+            # Encode the flights straight into this thread's feature buffer,
+            # without going through a DataFrame
+            features = model.encode(opera, tipovuelo, mes, out=_get_feature_buffer(len(flights)))
             
             # Make predictions
             predictions = model.predict(features)
             
-            logger.info(f"Successfully predicted delays for {len(predictions)} flights")
+            logger.info("Successfully predicted delays for %d flights", len(predictions))
             return predictions
             
         except ValidationError as e:
-            logger.error(f"Validation error in prediction: {str(e)}")
+            logger.error("Validation error in prediction: %s", e)
             raise
         except Exception as e:
-            logger.error(f"Error during prediction: {str(e)}")
+            logger.error("Error during prediction: %s", e)
             raise PredictionError(f"Failed to make predictions: {str(e)}")
     
     def is_model_available(self) -> bool:
@@ -28,12 +28,8 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from challenge.services.model_service import ModelService
 from challenge.config.settings import settings
-from challenge.core.logging import setup_logging
 
-# Setup logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -116,6 +112,14 @@ def train_model(model_path: str = None, data_path: str = None):
     Returns:
         bool: True if training succeeded, False otherwise
     """
+    # Imported here so that --help and argument errors don't pay for
+    # pandas, scikit-learn and xgboost
+    from challenge.core.logging import setup_logging
+    from challenge.services.model_service import ModelService
+
+    # Setup logging
+    setup_logging()
+
     try:
         # Determine model path priority: argument > env var > settings
         if model_path is None:
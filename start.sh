@@ -3,5 +3,8 @@
 # Wait for any initialization if needed
 echo "Starting API server..."
 
-# Start the FastAPI application
-exec uvicorn challenge.api:app --host 0.0.0.0 --port 8000 --workers 1
+# Start the FastAPI application with the uvloop event loop and httptools parser.
+# Set UVICORN_WORKERS (e.g. to $(nproc)) to run several worker processes.
+exec uvicorn challenge.api:app --host 0.0.0.0 --port 8000 \
+    --loop uvloop --http httptools \
+    --workers "${UVICORN_WORKERS:-1}"
@@ -1,4 +1,6 @@
 import unittest
+from contextlib import ExitStack
+from unittest import mock
 
 from fastapi.testclient import TestClient
 from challenge import app
@@ -6,7 +8,10 @@ from challenge import app
 
 class TestBatchPipeline(unittest.TestCase):
     def setUp(self):
-        self.client = TestClient(app)
+        # Run startup/shutdown so the model and prediction batcher are ready
+        stack = ExitStack()
+        self.client = stack.enter_context(TestClient(app))
+        self.addCleanup(stack.close)
         
     def test_should_get_predict(self):
         data = {
@@ -24,6 +29,17 @@ class TestBatchPipeline(unittest.TestCase):
         self.assertEqual(response.json(), {"predict": [0]})
     
 
+    def test_should_get_predict_with_coerced_month(self):
+        data = {
+            "flights": [
+                {"OPERA": "Aerolineas Argentinas", "TIPOVUELO": "N", "MES": "3"},
+                {"OPERA": "Aerolineas Argentinas", "TIPOVUELO": "N", "MES": 3.0}
+            ]
+        }
+        response = self.client.post("/predict", json=data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"predict": [0, 0]})
+
     def test_should_failed_unkown_column_1(self):
         data = {       
             "flights": [
@@ -64,4 +80,40 @@ class TestBatchPipeline(unittest.TestCase):
         }
         # when("xgboost.XGBClassifier").predict(ANY).thenReturn(np.array([0]))
         response = self.client.post("/predict", json=data)
-        self.assertEqual(response.status_code, 422)
\ No newline at end of file
+        self.assertEqual(response.status_code, 422)
+
+    def test_should_failed_unkown_column_reports_flight(self):
+        valid = {"OPERA": "Aerolineas Argentinas", "TIPOVUELO": "N", "MES": 3}
+        data = {
+            "flights": [valid, valid, valid, {**valid, "MES": 13}]
+        }
+        response = self.client.post("/predict", json=data)
+        self.assertEqual(response.status_code, 422)
+        errors = response.json()["detail"]
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]["loc"], ["body", "flights", 3, "MES"])
+        self.assertEqual(errors[0]["input"], 13)
+
+    def test_should_predict_with_model_when_not_in_table(self):
+        data = {
+            "flights": [
+                {"OPERA": "Aerolineas Argentinas", "TIPOVUELO": "N", "MES": 3},
+                {"OPERA": "Grupo LATAM", "TIPOVUELO": "I", "MES": 7}
+            ]
+        }
+        prediction_service = app.state.prediction_service
+        prediction_batcher = app.state.prediction_batcher
+        expected = [
+            prediction_service.model_service.prediction_table[(flight["OPERA"], flight["TIPOVUELO"], flight["MES"])]
+            for flight in data["flights"]
+        ]
+        # Drop the second flight from the table so the request goes to the batcher
+        table = dict(prediction_service.model_service.prediction_table)
+        del table[("Grupo LATAM", "I", 7)]
+        with mock.patch.object(prediction_service.model_service, "prediction_table", table), \
+                mock.patch.object(prediction_batcher, "submit", wraps=prediction_batcher.submit) as submit:
+            response = self.client.post("/predict", json=data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"predict": expected})
+        submit.assert_called_once()
@@ -0,0 +1,85 @@
+import asyncio
+import unittest
+
+from challenge.core.exceptions import PredictionError
+from challenge.services.prediction_batcher import PredictionBatcher
+
+
+class FakePredictionService:
+    """
+    Predicts each flight as twice its value and records every call.
+    """
+
+    def __init__(self, error: Exception = None):
+        self.calls = []
+        self.error = error
+
+    def predict_flights(self, flights):
+        self.calls.append(list(flights))
+        if self.error is not None:
+            raise self.error
+        return [flight * 2 for flight in flights]
+
+
+class TestPredictionBatcher(unittest.IsolatedAsyncioTestCase):
+
+    async def start_batcher(self, prediction_service) -> PredictionBatcher:
+        batcher = PredictionBatcher(prediction_service, max_batch_size=16, max_wait_ms=50)
+        await batcher.start()
+        self.addAsyncCleanup(batcher.stop)
+        return batcher
+
+    async def test_should_scatter_results_in_order(self):
+        service = FakePredictionService()
+        batcher = await self.start_batcher(service)
+
+        results = await asyncio.gather(
+            batcher.submit([1, 2, 3]),
+            batcher.submit([4]),
+            batcher.submit([5, 6])
+        )
+
+        self.assertEqual(results, [[2, 4, 6], [8], [10, 12]])
+        self.assertEqual(service.calls, [[1, 2, 3, 4, 5, 6]])
+
+    async def test_should_fail_every_request_of_the_batch(self):
+        error = PredictionError("boom")
+        batcher = await self.start_batcher(FakePredictionService(error=error))
+
+        results = await asyncio.gather(
+            batcher.submit([1]),
+            batcher.submit([2, 3]),
+            return_exceptions=True
+        )
+
+        self.assertEqual(results, [error, error])
+
+    async def test_should_keep_running_after_a_failed_batch(self):
+        service = FakePredictionService(error=PredictionError("boom"))
+        batcher = await self.start_batcher(service)
+
+        with self.assertRaises(PredictionError):
+            await batcher.submit([1])
+        service.error = None
+
+        self.assertEqual(await batcher.submit([2]), [4])
+
+    async def test_should_reject_submit_before_start(self):
+        batcher = PredictionBatcher(FakePredictionService())
+
+        self.assertFalse(batcher.is_running)
+        with self.assertRaises(RuntimeError):
+            await batcher.submit([1])
+
+    async def test_should_stop(self):
+        batcher = PredictionBatcher(FakePredictionService())
+        await batcher.start()
+        self.assertTrue(batcher.is_running)
+
+        await batcher.stop()
+
+        self.assertFalse(batcher.is_running)
+        with self.assertRaises(RuntimeError):
+            await batcher.submit([1])
+        # Stopping again is a no-op
+        await batcher.stop()
@@ -0,0 +1,30 @@
+from functools import lru_cache
+from typing import Tuple
+
+import pandas as pd
+
+from challenge.models.model import DelayModel
+
+
+@lru_cache(maxsize=None)
+def get_fitted_model() -> Tuple[DelayModel, pd.DataFrame]:
+    """
+    Fit a model on the training data once and share it across test classes.
+
+    Tests must not modify the returned model.
+
+    Returns:
+        Tuple[DelayModel, pd.DataFrame]: fitted model and the serving features
+            of the training data.
+    """
+    data = pd.read_csv(filepath_or_buffer="./data/data.csv")
+    model = DelayModel()
+    features, target = model.preprocess(
+        data=data,
+        target_column="delay"
+    )
+    model.fit(
+        features=features,
+        target=target
+    )
+    return model, model.preprocess(data=data)
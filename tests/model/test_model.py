@@ -1,10 +1,15 @@
+import pickle
 import unittest
+from unittest import mock
+
 import pandas as pd
 
 from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
 from challenge.models.model import DelayModel
 
+from .fitted_model import get_fitted_model
+
 
 class TestModel(unittest.TestCase):
 
@@ -111,4 +116,57 @@ class TestModel(unittest.TestCase):
 
         assert isinstance(predicted_targets, list)
         assert len(predicted_targets) == features.shape[0]
-        assert all(isinstance(predicted_target, int) for predicted_target in predicted_targets)
\ No newline at end of file
+        assert all(isinstance(predicted_target, int) for predicted_target in predicted_targets)
+
+
+class TestModelSerialization(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.model, cls.features = get_fitted_model()
+
+
+    def test_model_pickle_roundtrip(
+        self
+    ):
+        restored = pickle.loads(pickle.dumps(self.model))
+
+        assert restored.predict(self.features) == self.model.predict(self.features)
+        assert restored._feature_columns == self.model._feature_columns
+        for param in ("random_state", "learning_rate", "scale_pos_weight", "n_jobs"):
+            assert restored._model.get_params()[param] == self.model._model.get_params()[param]
+
+
+    def test_model_pickle_stores_native_booster(
+        self
+    ):
+        state = self.model.__getstate__()
+
+        assert set(state) == {"_feature_columns", "_params", "_booster_raw"}
+        assert isinstance(state["_booster_raw"], bytes)
+
+
+    def test_model_unpickle_legacy_format(
+        self
+    ):
+        # Models pickled before the booster was cached only held the classifier
+        legacy_state = {
+            "_model": self.model._model,
+            "_feature_columns": self.model._feature_columns
+        }
+        with mock.patch.object(DelayModel, "__getstate__", lambda model: legacy_state):
+            payload = pickle.dumps(self.model)
+
+        restored = pickle.loads(payload)
+
+        assert restored.predict(self.features) == self.model.predict(self.features)
+
+
+    def test_model_pickle_unfitted(
+        self
+    ):
+        restored = pickle.loads(pickle.dumps(DelayModel()))
+
+        assert restored._model is None
+        assert restored._feature_columns is None
+        assert restored._booster is None
@@ -0,0 +1,133 @@
+import os
+import pickle
+import tempfile
+import unittest
+from itertools import product
+from unittest import mock
+
+import pandas as pd
+
+from challenge.models.schemas import ALLOWED_MES, ALLOWED_OPERAS, ALLOWED_TIPOVUELO
+from challenge.utils import top_10_features
+from challenge.services.model_service import PYARROW_AVAILABLE, ZSTD_AVAILABLE, ZSTD_MAGIC, ModelService
+
+from .fitted_model import get_fitted_model
+
+
+class TestModelService(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.model, cls.features = get_fitted_model()
+
+
+    def setUp(self) -> None:
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.model_path = os.path.join(directory.name, "delay_model.pkl")
+        self.service = ModelService(model_path=self.model_path)
+
+
+    def test_model_service_save_and_load_local(
+        self
+    ):
+        self.service.model = self.model
+        self.service.is_trained = True
+        assert self.service.save_model()
+
+        service = ModelService(model_path=self.model_path)
+
+        assert service.load_model()
+        assert service.get_model().predict(self.features) == self.model.predict(self.features)
+
+
+    def test_model_service_load_plain_pickle(
+        self
+    ):
+        with open(self.model_path, "wb") as f:
+            pickle.dump(self.model, f)
+
+        assert self.service.load_model()
+        assert self.service.get_model().predict(self.features) == self.model.predict(self.features)
+
+        # Files joblib can't read are unpickled directly
+        with mock.patch("challenge.services.model_service.joblib.load", side_effect=ValueError):
+            model = self.service._read_model(self.model_path)
+        assert model.predict(self.features) == self.model.predict(self.features)
+
+
+    def test_model_service_load_missing_file(
+        self
+    ):
+        assert not self.service.load_model()
+        assert not self.service.is_trained
+
+
+    @unittest.skipUnless(ZSTD_AVAILABLE, "zstandard is not installed")
+    def test_model_service_read_zstd_model(
+        self
+    ):
+        self.service.model = self.model
+        self.service._write_compressed_model(self.model_path)
+
+        with open(self.model_path, "rb") as f:
+            assert f.read(len(ZSTD_MAGIC)) == ZSTD_MAGIC
+
+        model = self.service._read_model(self.model_path)
+        assert model.predict(self.features) == self.model.predict(self.features)
+
+        with mock.patch("challenge.services.model_service.ZSTD_AVAILABLE", False):
+            with self.assertRaises(RuntimeError):
+                self.service._read_model(self.model_path)
+
+
+    def test_model_service_prediction_table(
+        self
+    ):
+        self.service.model = self.model
+        self.service.is_trained = True
+
+        self.service._build_prediction_table()
+
+        keys = list(product(sorted(ALLOWED_OPERAS), sorted(ALLOWED_TIPOVUELO), sorted(ALLOWED_MES)))
+        assert len(self.service.prediction_table) == len(keys) == 480
+        # One-hot encode with pandas and predict through the sklearn wrapper,
+        # independently of the encode/booster path used to build the table
+        data = pd.DataFrame(keys, columns=["OPERA", "TIPOVUELO", "MES"])
+        features = pd.concat([
+            pd.get_dummies(data["OPERA"], prefix="OPERA"),
+            pd.get_dummies(data["TIPOVUELO"], prefix="TIPOVUELO"),
+            pd.get_dummies(data["MES"], prefix="MES")
+        ], axis=1).reindex(columns=top_10_features, fill_value=0).astype(float)
+        predictions = self.model._model.predict(features).tolist()
+        assert self.service.prediction_table == dict(zip(keys, predictions))
+
+
+    @unittest.skipUnless(PYARROW_AVAILABLE, "pyarrow is not installed")
+    def test_model_service_parquet_cache(
+        self
+    ):
+        data_path = os.path.join(os.path.dirname(self.model_path), "data.csv")
+        parquet_path = os.path.join(os.path.dirname(self.model_path), "data.parquet")
+        pd.DataFrame({"OPERA": ["Air France", "Iberia"], "MES": [3, 7]}).to_csv(data_path, index=False)
+        service = ModelService(model_path=self.model_path, data_path=data_path)
+
+        data = service._load_data_from_local()
+        assert os.path.exists(parquet_path)
+
+        # Reused while the CSV hasn't changed
+        with mock.patch.object(service, "_read_csv", side_effect=AssertionError("CSV was parsed")):
+            cached = service._load_data_from_local()
+        pd.testing.assert_frame_equal(cached, data)
+
+        # Rebuilt once the CSV is newer
+        pd.DataFrame({"OPERA": ["Copa Air"], "MES": [12]}).to_csv(data_path, index=False)
+        mtime = os.stat(parquet_path).st_mtime + 10
+        os.utime(data_path, (mtime, mtime))
+
+        data = service._load_data_from_local()
+        assert data["OPERA"].tolist() == ["Copa Air"]
+        with mock.patch.object(service, "_read_csv", side_effect=AssertionError("CSV was parsed")):
+            cached = service._load_data_from_local()
+        pd.testing.assert_frame_equal(cached, data)
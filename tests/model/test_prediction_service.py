@@ -0,0 +1,75 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from challenge.models.schemas import FlightItem
+from challenge.services import prediction_service
+from challenge.services.model_service import ModelService
+from challenge.services.prediction_service import PredictionService
+
+from .fitted_model import get_fitted_model
+
+
+def make_flights(opera: str, tipovuelo: str, mes: int, count: int):
+    return [FlightItem(OPERA=opera, TIPOVUELO=tipovuelo, MES=mes)] * count
+
+
+class TestPredictionService(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.model, _ = get_fitted_model()
+
+
+    def setUp(self) -> None:
+        super().setUp()
+        model_service = ModelService(model_path="unused.pkl")
+        model_service.model = self.model
+        model_service.is_trained = True
+        self.service = PredictionService(model_service)
+
+
+    def expected(self, flights):
+        features = self.model.encode(
+            [flight.OPERA for flight in flights],
+            [flight.TIPOVUELO for flight in flights],
+            [flight.MES for flight in flights]
+        )
+        return self.model.predict(features)
+
+
+    def test_predict_reuses_buffer_without_stale_rows(
+        self
+    ):
+        # Each large-batch row sets three one-hot columns, each small-batch
+        # row none, so rows left over from the first batch would show up
+        large = make_flights("Grupo LATAM", "I", 7, 1000)
+        small = make_flights("Air France", "N", 1, 10)
+
+        assert self.service.predict_flights(large) == self.expected(large)
+        buffer = prediction_service._scratch.buffer
+
+        assert self.service.predict_flights(small) == self.expected(small)
+        assert prediction_service._scratch.buffer is buffer
+        assert not buffer[:len(small)].any()
+
+
+    def test_predict_above_buffer_cap(
+        self
+    ):
+        flights = (
+            make_flights("Grupo LATAM", "I", 7, 20)
+            + make_flights("Air France", "N", 1, 20)
+        )
+        self.service.predict_flights(flights[:8])
+        buffer = prediction_service._scratch.buffer
+
+        with mock.patch.object(prediction_service, "_MAX_BUFFER_ROWS", 16):
+            features = prediction_service._get_feature_buffer(len(flights))
+            predictions = self.service.predict_flights(flights)
+
+        assert not np.shares_memory(features, buffer)
+        assert predictions == self.expected(flights)
+        # The retained buffer did not grow to the large batch
+        assert prediction_service._scratch.buffer is buffer